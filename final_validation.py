@@ -8,7 +8,13 @@ import requests
 import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+
+# Shared keep-alive session so probes reuse pooled connections
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 def print_header(title):
     """Print formatted header"""
@@ -22,16 +28,24 @@ def print_check(item, status):
     print(f"{emoji} {item}")
     return status
 
-def test_dashboard_endpoint(endpoint, description):
-    """Test a dashboard endpoint"""
+def probe_endpoint(endpoint):
+    """Fetch a dashboard endpoint, returning (success, error message)"""
     try:
-        response = requests.get(f"http://localhost:5000{endpoint}", timeout=5)
-        success = response.status_code == 200 and len(response.json()) > 0
-        print_check(f"{description}: {endpoint}", success)
-        return success
+        response = SESSION.get(f"http://localhost:5000{endpoint}", timeout=5)
+        return response.status_code == 200 and len(response.json()) > 0, None
     except Exception as e:
-        print_check(f"{description}: {endpoint} - Error: {str(e)}", False)
-        return False
+        return False, str(e)
+
+def report_endpoint(endpoint, description, result):
+    """Print the outcome of an endpoint probe"""
+    success, error = result
+    if error is not None:
+        return print_check(f"{description}: {endpoint} - Error: {error}", False)
+    return print_check(f"{description}: {endpoint}", success)
+
+def test_dashboard_endpoint(endpoint, description):
+    """Test a dashboard endpoint"""
+    return report_endpoint(endpoint, description, probe_endpoint(endpoint))
 
 def validate_real_metrics():
     """Validate that we're getting real system metrics"""
@@ -39,7 +53,7 @@ def validate_real_metrics():
     
     try:
         # Test verification endpoint
-        response = requests.get("http://localhost:5000/api/verification", timeout=5)
+        response = SESSION.get("http://localhost:5000/api/verification", timeout=5)
         data = response.json()
         
         checks = []
@@ -53,9 +67,9 @@ def validate_real_metrics():
                                 data.get("verification", {}).get("raw_system_data", {}).get("cpu_percent_raw", 0) >= 0))
         
         # Test that metrics change over time
-        response1 = requests.get("http://localhost:5000/api/metrics", timeout=5)
-        time.sleep(2)
-        response2 = requests.get("http://localhost:5000/api/metrics", timeout=5)
+        response1 = SESSION.get("http://localhost:5000/api/metrics", timeout=5)
+        time.sleep(3)  # Outlast the 2s response cache on /api/metrics
+        response2 = SESSION.get("http://localhost:5000/api/metrics", timeout=5)
         
         metrics1 = response1.json().get("current", {})
         metrics2 = response2.json().get("current", {})
@@ -75,7 +89,7 @@ def validate_ai_ml():
     
     try:
         # Test predictions endpoint
-        response = requests.get("http://localhost:5000/api/predictions", timeout=5)
+        response = SESSION.get("http://localhost:5000/api/predictions", timeout=5)
         data = response.json()
         
         checks = []
@@ -100,7 +114,7 @@ def validate_scaling_engine():
     
     try:
         # Test scaling status
-        response = requests.get("http://localhost:5000/api/scaling/status", timeout=5)
+        response = SESSION.get("http://localhost:5000/api/scaling/status", timeout=5)
         data = response.json()
         
         checks = []
@@ -114,7 +128,7 @@ def validate_scaling_engine():
                                 "total_cost" in data))
         
         # Test scaling execution
-        response = requests.post("http://localhost:5000/api/scaling/execute", 
+        response = SESSION.post("http://localhost:5000/api/scaling/execute", 
                                json={"instances": 2}, timeout=5)
         scaling_success = response.status_code == 200
         checks.append(print_check("Scaling execution available", scaling_success))
@@ -141,12 +155,16 @@ def validate_dashboard():
         ("/api/verification", "Verification API")
     ]
     
-    for endpoint, description in endpoints:
-        checks.append(test_dashboard_endpoint(endpoint, description))
+    # Probes are independent, so run them concurrently and report in order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(probe_endpoint, [endpoint for endpoint, _ in endpoints]))
+    
+    for (endpoint, description), result in zip(endpoints, results):
+        checks.append(report_endpoint(endpoint, description, result))
     
     # Test dashboard UI
     try:
-        response = requests.get("http://localhost:5000", timeout=5)
+        response = SESSION.get("http://localhost:5000", timeout=5)
         ui_works = response.status_code == 200 and "Smart Auto-Scaling Dashboard" in response.text
         checks.append(print_check("Web UI accessible", ui_works))
     except:
@@ -212,7 +230,7 @@ def main():
     
     # Check if dashboard is running
     try:
-        requests.get("http://localhost:5000/api/system/health", timeout=5)
+        SESSION.get("http://localhost:5000/api/system/health", timeout=5)
         dashboard_running = True
     except:
         dashboard_running = False
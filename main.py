@@ -1,11 +1,16 @@
+import logging
+import os
 import time
 import threading
-from datetime import datetime
 from metrics_collector import MetricsCollector
 from predictor import DemandPredictor
 from scaling_engine import ScalingEngine
 from resource_manager import ResourceManager
 
+# Loop output goes through logging; main() attaches a console handler for the CLI
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 class AutoScalingOrchestrator:
     """Main orchestrator that coordinates all auto-scaling components"""
     
@@ -17,7 +22,7 @@ class AutoScalingOrchestrator:
         self.resource_manager = ResourceManager()
         
         # Control variables
-        self.running = False
+        self._stop = threading.Event()
         self.collection_interval = 60  # Collect metrics every 60 seconds
         self.scaling_interval = 300   # Check scaling every 5 minutes
         
@@ -26,7 +31,7 @@ class AutoScalingOrchestrator:
     
     def start_monitoring(self):
         """Start the monitoring and auto-scaling process"""
-        self.running = True
+        self._stop.clear()
         
         # Start metrics collection thread
         metrics_thread = threading.Thread(target=self._metrics_collection_loop, daemon=True)
@@ -42,65 +47,79 @@ class AutoScalingOrchestrator:
         print("\nPress Ctrl+C to stop...\n")
         
         try:
-            # Keep main thread alive
-            while self.running:
-                time.sleep(1)
+            # Keep main thread alive until stopped. The Windows console only
+            # delivers Ctrl+C between waits, so wake up periodically there
+            wait_timeout = 1 if os.name == 'nt' else None
+            while not self._stop.wait(wait_timeout):
+                pass
         except KeyboardInterrupt:
             self.stop_monitoring()
     
     def stop_monitoring(self):
         """Stop the monitoring process"""
-        self.running = False
+        self._stop.set()
         print("\n🛑 Stopping auto-scaling system...")
+        self.metrics_collector.flush()
         print("✅ System stopped gracefully")
     
+    def _next_deadline(self, deadline: float, interval: float) -> float:
+        """Advance a monotonic deadline by one interval, skipping ticks that were missed entirely"""
+        deadline += interval
+        now = time.monotonic()
+        if deadline < now:
+            deadline += (now - deadline) // interval * interval + interval
+        return deadline
+    
     def _metrics_collection_loop(self):
         """Background thread for collecting metrics"""
-        while self.running:
+        # Ticks are scheduled on absolute deadlines so work time never adds drift
+        deadline = time.monotonic()
+        while not self._stop.is_set():
             try:
                 # Collect current metrics
                 metrics = self.metrics_collector.collect_metrics()
                 self.metrics_collector.store_metrics(metrics)
                 
-                print(f"📊 [{datetime.now().strftime('%H:%M:%S')}] "
-                      f"CPU: {metrics['cpu_percent']:.1f}%, "
-                      f"Memory: {metrics['memory_percent']:.1f}%, "
-                      f"Load: {metrics['load_score']:.1f}")
+                logger.info("📊 CPU: %.1f%%, Memory: %.1f%%, Load: %.1f",
+                            metrics['cpu_percent'], metrics['memory_percent'], metrics['load_score'])
                 
             except Exception as e:
-                print(f"❌ Metrics collection error: {e}")
+                logger.error("❌ Metrics collection error: %s", e)
             
-            time.sleep(self.collection_interval)
+            deadline = self._next_deadline(deadline, self.collection_interval)
+            self._stop.wait(max(0, deadline - time.monotonic()))
     
     def _scaling_decision_loop(self):
         """Background thread for making scaling decisions"""
-        while self.running:
+        deadline = time.monotonic()
+        while not self._stop.is_set():
             try:
-                # Wait for initial metrics collection
-                time.sleep(self.scaling_interval)
+                # Wait for the next tick (the first one leaves time for initial metrics)
+                deadline = self._next_deadline(deadline, self.scaling_interval)
+                self._stop.wait(max(0, deadline - time.monotonic()))
                 
-                if not self.running:
+                if self._stop.is_set():
                     break
                 
-                # Get recent metrics
-                recent_metrics = self.metrics_collector.get_recent_metrics(30)
+                # Snapshot recent metrics as columns; training and prediction both read it
+                recent_metrics = self.metrics_collector.get_recent_as_arrays(30, copy=True)
                 
-                if len(recent_metrics) < 5:
-                    print("⏳ Waiting for more metrics before making scaling decisions...")
+                if len(recent_metrics['load_score']) < 5:
+                    logger.info("⏳ Waiting for more metrics before making scaling decisions...")
                     continue
                 
                 # Train predictor if needed
                 if not self.predictor.is_trained:
-                    print("🤖 Training prediction model...")
+                    logger.info("🤖 Training prediction model...")
                     success = self.predictor.train_model(recent_metrics)
                     if success:
-                        print("✅ Model trained successfully")
+                        logger.info("✅ Model trained successfully")
                     else:
-                        print("❌ Model training failed, using fallback predictions")
+                        logger.warning("❌ Model training failed, using fallback predictions")
                 
                 # Get predictions and recommendation
                 predictions = self.predictor.predict_demand(recent_metrics, horizon=5)
-                current_load = recent_metrics[-1]['load_score']
+                current_load = float(recent_metrics['load_score'][-1])
                 recommendation = self.predictor.get_scaling_recommendation(predictions, current_load)
                 
                 # Get current resource state
@@ -117,33 +136,26 @@ class AutoScalingOrchestrator:
                 )
                 
                 # Log the decision
-                print(f"\n🎯 [{datetime.now().strftime('%H:%M:%S')}] Scaling Decision:")
-                print(f"   Action: {decision['action'].upper()}")
-                print(f"   Confidence: {decision['confidence']:.1%}")
-                print(f"   Reason: {decision['reason']}")
-                
-                if decision['action'] != 'maintain':
-                    print(f"   Instances: {decision['current_instances']} → {decision['recommended_instances']}")
-                    print(f"   Cost Impact: ${decision['cost_impact']['hourly_cost_change']:.2f}/hour")
+                logger.info("🎯 Scaling Decision: %s (confidence %.1f%%) - %s",
+                            decision['action'].upper(), decision['confidence'] * 100, decision['reason'])
                 
                 # Execute scaling decision
                 if decision['action'] != 'maintain':
-                    print("⚙️ Executing scaling action...")
+                    logger.info("   Instances: %s → %s, Cost Impact: $%.2f/hour",
+                                decision['current_instances'], decision['recommended_instances'],
+                                decision['cost_impact']['hourly_cost_change'])
+                    logger.info("⚙️ Executing scaling action...")
                     execution_result = self.resource_manager.execute_scaling_decision(decision)
                     
                     if execution_result['status'] == 'completed':
-                        print(f"✅ Scaling completed successfully in {execution_result['execution_time_seconds']:.1f}s")
+                        logger.info("✅ Scaling completed successfully in %.1fs", execution_result['execution_time_seconds'])
                     else:
-                        print(f"❌ Scaling failed: {execution_result.get('errors', ['Unknown error'])}")
+                        logger.error("❌ Scaling failed: %s", execution_result.get('errors', ['Unknown error']))
                 else:
-                    print("➡️ No scaling action needed")
-                
-                print()  # Empty line for readability
+                    logger.info("➡️ No scaling action needed")
                 
             except Exception as e:
-                print(f"❌ Scaling decision error: {e}")
-            
-            time.sleep(self.scaling_interval)
+                logger.error("❌ Scaling decision error: %s", e)
     
     def run_demo(self):
         """Run a quick demo of the system"""
@@ -160,7 +172,7 @@ class AutoScalingOrchestrator:
         
         # Train the model
         print("\n🤖 Training prediction model...")
-        recent_metrics = self.metrics_collector.get_recent_metrics()
+        recent_metrics = self.metrics_collector.get_recent_as_arrays(copy=True)
         success = self.predictor.train_model(recent_metrics)
         
         if success:
@@ -172,7 +184,7 @@ class AutoScalingOrchestrator:
             print(f"   Next 5 predictions: {[f'{p:.1f}' for p in predictions]}")
             
             # Get recommendation
-            current_load = recent_metrics[-1]['load_score']
+            current_load = float(recent_metrics['load_score'][-1])
             recommendation = self.predictor.get_scaling_recommendation(predictions, current_load)
             print(f"   Recommendation: {recommendation['action'].upper()} (confidence: {recommendation['confidence']:.1%})")
             print(f"   Reason: {recommendation['reason']}")
@@ -208,6 +220,7 @@ class AutoScalingOrchestrator:
 def main():
     import sys
     
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s', datefmt='%H:%M:%S')
     orchestrator = AutoScalingOrchestrator()
     
     if len(sys.argv) > 1 and sys.argv[1] == '--monitor':
@@ -1,53 +1,286 @@
 import psutil
+import numpy as np
+import orjson
+import functools
+import getpass
+import heapq
+import itertools
+import operator
+import platform
 import time
 import json
 import os
-import shutil
+import queue
+import socket
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# Samples kept in memory; the on-disk log is compacted back to this many
+HISTORY_SIZE = 1000
+METRICS_LOG_MAX_BYTES = 4 * 1024 * 1024
+
+# Pre-log history file (one JSON array), migrated into the log on first start
+LEGACY_STORAGE_FILE = "metrics.json"
+
+# Seconds before the hostname/IP lookup in verification info is refreshed
+NETWORK_INFO_TTL = 60
+
+# Sample batches waiting for the log writer before new ones are dropped
+WRITE_QUEUE_SIZE = 64
+
+# Numeric columns mirrored into the in-memory columnar ring buffer
+RING_CAPACITY = 1000
+RING_COLUMNS = ['cpu_percent', 'memory_percent', 'response_time_ms', 'load_score']
+RING_COUNTER_COLUMNS = {
+    'ts_ns': np.int64,
+    'active_connections': np.int32,
+    'network_bytes_sent': np.int64,
+    'network_bytes_recv': np.int64
+}
+
+# Load score weights; response time saturates at 200ms, so its 0.3 weight
+# and the 100/200 normalization fold into one per-millisecond factor
+LOAD_WEIGHT_CPU = 0.4
+LOAD_WEIGHT_MEMORY = 0.3
+LOAD_RESPONSE_CAP_MS = 200.0
+LOAD_RESPONSE_SCALE = 0.3 * 100 / LOAD_RESPONSE_CAP_MS
+
+# Simulated application metrics: a base value plus a per-CPU-percent slope
+# (response time rises 200ms and connections by 500 from idle to full CPU)
+SIM_BASE_RESPONSE_MS = 50.0
+SIM_RESPONSE_SLOPE = 2.0
+SIM_BASE_CONNECTIONS = 100
+SIM_CONNECTION_SLOPE = 5.0
+
+# Window of the background CPU sampler, in seconds
+CPU_SAMPLE_INTERVAL = 1.0
+
+# System drive whose usage is reported, resolved once at import
+DISK_ROOT = 'C:\\' if os.name == 'nt' else '/'
+
+def _disk_usage(_root: str = DISK_ROOT, _du=psutil.disk_usage):
+    """Usage (total, used, free, percent) of the system drive"""
+    return _du(_root)
+
+class Sample(NamedTuple):
+    """Compact immutable record of one stored sample, fields in API order"""
+    timestamp: str
+    ts_ns: int
+    cpu_percent: float
+    memory_percent: float
+    memory_used_gb: float
+    disk_percent: float
+    network_bytes_sent: int
+    network_bytes_recv: int
+    response_time_ms: float
+    active_connections: int
+    load_score: float
+    
+    @classmethod
+    def from_dict(cls, metrics: Dict) -> 'Sample':
+        return cls(*[metrics[field] for field in cls._fields])
+    
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+def _sample_from_dict(metrics: Dict) -> Sample:
+    """Build a Sample from a stored record, deriving ts_ns for records logged before it existed"""
+    if 'ts_ns' not in metrics:
+        metrics['ts_ns'] = int(datetime.fromisoformat(metrics['timestamp']).timestamp() * 1e9)
+    return Sample.from_dict(metrics)
+
+@functools.lru_cache(maxsize=1)
+def iso_second(second: int) -> str:
+    """Local ISO timestamp of a whole epoch second, reused while that second is current"""
+    return datetime.fromtimestamp(second).isoformat()
+
+def isoformat_ns(ts_ns: int) -> str:
+    """Local ISO timestamp for epoch nanoseconds, as datetime.isoformat() renders it"""
+    second, micros = divmod(ts_ns // 1000, 1_000_000)
+    prefix = iso_second(second)
+    return f"{prefix}.{micros:06d}" if micros else prefix
+
+def _timestamp_now() -> Tuple[int, str]:
+    """Current time as epoch nanoseconds plus the matching local ISO string"""
+    ts_ns = time.time_ns()
+    return ts_ns, datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+
+def simulate_response_times(cpu: np.ndarray) -> np.ndarray:
+    """Vectorized simulated response time (ms) over an array of CPU readings, as float32"""
+    return np.float32(SIM_BASE_RESPONSE_MS) + np.asarray(cpu, dtype=np.float32) * np.float32(SIM_RESPONSE_SLOPE)
+
+def calculate_load_scores(cpu: np.ndarray, memory: np.ndarray, response_time: np.ndarray) -> np.ndarray:
+    """Vectorized load score (0-100) over arrays of samples, as float32"""
+    cpu = np.asarray(cpu, dtype=np.float32)
+    memory = np.asarray(memory, dtype=np.float32)
+    response_time = np.asarray(response_time, dtype=np.float32)
+    scores = np.minimum(response_time, np.float32(LOAD_RESPONSE_CAP_MS)) * np.float32(LOAD_RESPONSE_SCALE)
+    scores += cpu * np.float32(LOAD_WEIGHT_CPU)
+    scores += memory * np.float32(LOAD_WEIGHT_MEMORY)
+    return scores
 
 class MetricsCollector:
     """Collects system performance metrics"""
     
-    def __init__(self, storage_file: str = "metrics.json"):
+    def __init__(self, storage_file: str = "metrics.ndjson"):
         self.storage_file = storage_file
+        self._log_size = os.path.getsize(storage_file) if os.path.exists(storage_file) else 0
         self.metrics_history = self._load_metrics()
+        # Samples ever stored and ever written to the log; loaded samples are on disk already
+        self._stored_seq = self._written_seq = len(self.metrics_history)
+        
+        # Disk writes happen on a daemon thread so callers never wait on I/O
+        self._write_q = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self.dropped_writes = 0
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+        
+        # One array per column (SoA). Each sample is written twice (at i and
+        # i + capacity) so the most recent window is always one contiguous slice.
+        # The float columns are rows of one block so their means are a single reduction
+        self._ring_block = np.zeros((len(RING_COLUMNS), 2 * RING_CAPACITY), dtype=np.float32)
+        self._ring = dict(zip(RING_COLUMNS, self._ring_block))
+        for col, dtype in RING_COUNTER_COLUMNS.items():
+            self._ring[col] = np.empty(2 * RING_CAPACITY, dtype=dtype)
+        self._ring['timestamp'] = np.empty(2 * RING_CAPACITY, dtype='datetime64[ns]')
+        # Writers serialize on this lock; readers never take it. Instead they
+        # snapshot _ring_count, which is only bumped after a sample is fully
+        # written, and copying readers check the seqlock counter _ring_seq
+        # (odd while a write is in progress) to retry if a write overlapped
+        self._ring_lock = threading.Lock()
+        self._ring_count = 0
+        self._ring_seq = 0
+        for sample in itertools.islice(self.metrics_history, max(0, len(self.metrics_history) - RING_CAPACITY), None):
+            self._ring_write(sample.to_dict())
+        
+        # Most recent sample as (monotonic time, metrics, raw counters) for get_or_collect
+        self._last = None
+        
+        # Top-process scan as ((epoch second, limit), processes), reused within a second
+        self._process_cache = None
+        
+        # Host facts for verification, built on first use; network info as (expiry, info)
+        self._static_info = None
+        self._network_info = None
+        
+        # Queues of live stream listeners, fed on every store_metrics
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
+        
+        # CPU usage needs a measurement window, so a daemon thread keeps the
+        # latest reading fresh and collect_metrics never blocks on it
+        self._cpu_percent = float(psutil.cpu_percent(interval=0.1))
+        self._sampler = threading.Thread(target=self._sample_cpu_loop, daemon=True)
+        self._sampler.start()
     
-    def _load_metrics(self) -> List[Dict]:
-        """Load existing metrics from file"""
-        if os.path.exists(self.storage_file):
+    def _sample_cpu_loop(self):
+        """Background thread that continuously samples CPU usage"""
+        # Prime per-process CPU counters; psutil.process_iter reuses these Process
+        # objects, so get_process_details reads real deltas rather than first-call zeros
+        for proc in psutil.process_iter():
+            try:
+                proc.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        while True:
             try:
-                with open(self.storage_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+                self._cpu_percent = float(psutil.cpu_percent(interval=CPU_SAMPLE_INTERVAL))
+            except Exception as e:
+                print(f"CPU sampling error: {e}")
+                time.sleep(CPU_SAMPLE_INTERVAL)
     
-    def _save_metrics(self):
-        """Save metrics to file"""
-        with open(self.storage_file, 'w') as f:
-            json.dump(self.metrics_history, f, indent=2)
+    def _load_metrics(self) -> Deque[Sample]:
+        """Load the most recent metrics from the line-delimited log, migrating legacy JSON history"""
+        history = deque(maxlen=HISTORY_SIZE)
+        source = self.storage_file
+        if not os.path.exists(source) and os.path.exists(LEGACY_STORAGE_FILE):
+            source = LEGACY_STORAGE_FILE
+        try:
+            with open(source, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return history
+        
+        if data.lstrip()[:1] == b'[':
+            # History saved before the log format: one indented JSON array
+            try:
+                records = orjson.loads(data)
+            except ValueError as e:
+                print(f"Could not migrate legacy metrics from {source}: {e}")
+                return history
+            for metrics in records:
+                try:
+                    history.append(_sample_from_dict(metrics))
+                except (ValueError, KeyError, TypeError):
+                    continue
+            self._log_size = self._write_log(history)
+            print(f"Migrated {len(history)} legacy metrics samples from {source} to {self.storage_file}")
+            return history
+        
+        for line in data.splitlines():
+            try:
+                history.append(_sample_from_dict(orjson.loads(line)))
+            except (ValueError, KeyError, TypeError):
+                continue  # Skip a torn, blank or incomplete line
+        return history
     
-    def collect_metrics(self) -> Dict:
-        """Collect current system metrics"""
-        timestamp = datetime.now().isoformat()
+    def _writer_loop(self):
+        """Background thread that appends queued batches of samples to the log"""
+        while True:
+            end_seq, batch = self._write_q.get()
+            try:
+                self._save_metrics(batch, end_seq)
+            except Exception as e:
+                print(f"Metrics write error: {e}")
+            finally:
+                self._write_q.task_done()
+    
+    def flush(self):
+        """Block until every queued sample has been written"""
+        self._write_q.join()
+    
+    def _save_metrics(self, batch: List[Dict], end_seq: int):
+        """Append a batch ending at sample number end_seq in one write, compacting the log once it grows too large"""
+        data = b"".join(orjson.dumps(metrics) + b"\n" for metrics in batch)
+        with open(self.storage_file, 'ab') as f:
+            f.write(data)
+        self._written_seq = end_seq
+        self._log_size += len(data)
+        if self._log_size > METRICS_LOG_MAX_BYTES:
+            self._compact_log()
+    
+    def _compact_log(self):
+        """Rewrite the log with only the samples still held in memory, up to the last one written
         
-        # System metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
+        Later samples are still queued and are appended by their own batches.
+        """
+        with self._ring_lock:
+            history = list(self.metrics_history)
+            pending = self._stored_seq - self._written_seq
+        if pending:
+            history = history[:max(0, len(history) - pending)]
+        self._log_size = self._write_log(history)
+    
+    def _write_log(self, history) -> int:
+        """Atomically replace the log with the given samples, returning its size in bytes"""
+        data = b"".join(orjson.dumps(sample.to_dict()) + b"\n" for sample in history)
+        tmp_file = self.storage_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.storage_file)
+        return len(data)
+    
+    def _read_counters(self) -> Tuple:
+        """Read memory, disk usage and network byte counters in one sweep"""
         memory = psutil.virtual_memory()
         
-        # Get disk usage for Windows
         try:
-            if os.name == 'nt':  # Windows
-                total, used, free = shutil.disk_usage('C:')
-                disk_percent = (used / total) * 100
-            else:  # Unix/Linux
-                total, used, free = shutil.disk_usage('/')
-                disk_percent = (used / total) * 100
+            disk = _disk_usage()
         except Exception as e:
             print(f"Disk usage error: {e}")
-            # Fallback if disk access fails
-            disk_percent = 50.0
+            disk = None
         
         # Network metrics (simplified, with error handling)
         try:
@@ -58,12 +291,28 @@ class MetricsCollector:
             network_sent = 0
             network_recv = 0
         
+        return memory, disk, network_sent, network_recv
+    
+    def collect_metrics(self) -> Dict:
+        """Collect current system metrics"""
+        # Epoch nanoseconds order samples numerically; the ISO string is for display
+        ts_ns, timestamp = _timestamp_now()
+        
+        # System metrics (CPU comes from the background sampler)
+        cpu_percent = self._cpu_percent
+        counters = self._read_counters()
+        memory, disk, network_sent, network_recv = counters
+        
+        # Fallback if disk access fails
+        disk_percent = (disk.used / disk.total) * 100 if disk else 50.0
+        
         # Simulate application-specific metrics
         response_time = self._simulate_response_time(cpu_percent)
         active_connections = self._simulate_connections(cpu_percent)
         
         metrics = {
             'timestamp': timestamp,
+            'ts_ns': ts_ns,
             'cpu_percent': float(cpu_percent),
             'memory_percent': float(memory.percent),
             'memory_used_gb': float(memory.used / (1024**3)),
@@ -75,116 +324,267 @@ class MetricsCollector:
             'load_score': float(self._calculate_load_score(cpu_percent, memory.percent, response_time))
         }
         
+        self._last = (time.monotonic(), metrics, counters)
         return metrics
     
+    def get_or_collect(self, max_age: float = 0.5) -> Dict:
+        """Return the last collected sample if it is fresher than max_age seconds, else collect"""
+        last = self._last
+        if last is not None and time.monotonic() - last[0] <= max_age:
+            return last[1]
+        return self.collect_metrics()
+    
+    def perturb_metrics(self, base: Dict, cpu_delta: float) -> Dict:
+        """Derive a fresh sample from base with CPU shifted by cpu_delta, without a psutil sweep"""
+        cpu_percent = min(100.0, max(0.0, base['cpu_percent'] + cpu_delta))
+        response_time = self._simulate_response_time(cpu_percent)
+        ts_ns, timestamp = _timestamp_now()
+        return dict(
+            base,
+            timestamp=timestamp,
+            ts_ns=ts_ns,
+            cpu_percent=cpu_percent,
+            response_time_ms=float(response_time),
+            active_connections=int(self._simulate_connections(cpu_percent)),
+            load_score=float(self._calculate_load_score(cpu_percent, base['memory_percent'], response_time))
+        )
+    
+    def generate_synthetic(self, n: int) -> Dict[str, np.ndarray]:
+        """Generate n synthetic samples one minute apart, as columns laid out like get_recent_as_arrays
+        
+        Lets demos and benchmarks feed the predictor in one call instead of collecting live samples.
+        """
+        start_ns, _ = _timestamp_now()
+        steps = np.arange(n)
+        timestamps = np.datetime64(datetime.fromtimestamp(start_ns / 1e9), 'ns') + steps * np.timedelta64(1, 'm')
+        
+        cpu = np.random.uniform(5, 95, n).astype(np.float32)
+        memory = np.random.uniform(20, 80, n).astype(np.float32)
+        response = simulate_response_times(cpu)
+        return {
+            'cpu_percent': cpu,
+            'memory_percent': memory,
+            'response_time_ms': response,
+            'load_score': np.round(calculate_load_scores(cpu, memory, response), 2),
+            'ts_ns': start_ns + steps * 60_000_000_000,
+            'active_connections': SIM_BASE_CONNECTIONS + (cpu * SIM_CONNECTION_SLOPE).astype(np.int32),
+            'network_bytes_sent': np.cumsum(np.random.randint(0, 1 << 20, n, dtype=np.int64)),
+            'network_bytes_recv': np.cumsum(np.random.randint(0, 1 << 20, n, dtype=np.int64)),
+            'timestamp': timestamps
+        }
+    
     def _simulate_response_time(self, cpu_percent: float) -> float:
         """Simulate application response time based on CPU usage"""
-        base_time = 50  # Base response time in ms
-        load_factor = (cpu_percent / 100) * 200  # Increase with CPU load
-        return round(base_time + load_factor, 2)
+        return SIM_BASE_RESPONSE_MS + cpu_percent * SIM_RESPONSE_SLOPE
     
     def _simulate_connections(self, cpu_percent: float) -> int:
         """Simulate active connections based on system load"""
-        base_connections = 100
-        load_connections = int((cpu_percent / 100) * 500)
-        return base_connections + load_connections
+        return SIM_BASE_CONNECTIONS + int(cpu_percent * SIM_CONNECTION_SLOPE)
     
     def _calculate_load_score(self, cpu: float, memory: float, response_time: float) -> float:
         """Calculate overall load score (0-100)"""
-        # Weighted average of different metrics
-        weights = {'cpu': 0.4, 'memory': 0.3, 'response': 0.3}
-        response_score = min((response_time / 200) * 100, 100)  # Normalize response time
-        
+        # Weighted average of cpu, memory and normalized response time
         load_score = (
-            cpu * weights['cpu'] +
-            memory * weights['memory'] +
-            response_score * weights['response']
+            cpu * LOAD_WEIGHT_CPU +
+            memory * LOAD_WEIGHT_MEMORY +
+            min(response_time, LOAD_RESPONSE_CAP_MS) * LOAD_RESPONSE_SCALE
         )
         
         return round(load_score, 2)
     
     def store_metrics(self, metrics: Dict):
         """Store metrics in history"""
-        self.metrics_history.append(metrics)
-        
-        # Keep only last 1000 entries to prevent file from growing too large
-        if len(self.metrics_history) > 1000:
-            self.metrics_history = self.metrics_history[-1000:]
+        self.store_metrics_batch([metrics])
+    
+    def store_metrics_batch(self, batch: List[Dict]):
+        """Store several samples in order, handing them to the log writer as a single write"""
+        with self._ring_lock:
+            for metrics in batch:
+                # Bounded deque keeps only the last HISTORY_SIZE entries, as compact records
+                self.metrics_history.append(Sample.from_dict(metrics))
+                self._ring_write(metrics)
+            self._stored_seq += len(batch)
+            
+            # Queued under the lock so batches reach the writer in sequence order
+            try:
+                self._write_q.put_nowait((self._stored_seq, list(batch)))
+                dropped = 0
+            except queue.Full:
+                self.dropped_writes += len(batch)
+                dropped = len(batch)
+        if dropped:
+            print(f"Metrics writer is behind, dropped {dropped} sample(s) ({self.dropped_writes} total)")
+        for metrics in batch:
+            self._publish(metrics)
+    
+    def subscribe(self, maxsize: int = 100) -> queue.Queue:
+        """Register a listener queue that receives every newly stored sample"""
+        listener = queue.Queue(maxsize=maxsize)
+        with self._subscribers_lock:
+            self._subscribers.append(listener)
+        return listener
+    
+    def unsubscribe(self, listener: queue.Queue):
+        """Remove a listener queue registered with subscribe"""
+        with self._subscribers_lock:
+            if listener in self._subscribers:
+                self._subscribers.remove(listener)
+    
+    def _publish(self, metrics: Dict):
+        """Push a stored sample to all listeners, dropping it for listeners that fall behind"""
+        with self._subscribers_lock:
+            listeners = list(self._subscribers)
+        for listener in listeners:
+            try:
+                listener.put_nowait(metrics)
+            except queue.Full:
+                pass
+    
+    def _ring_write(self, metrics: Dict):
+        """Write the numeric columns and timestamp of a sample into the ring buffer"""
+        self._ring_seq += 1
+        ring_count = self._ring_count
+        pos = ring_count % RING_CAPACITY
+        for col, column in self._ring.items():
+            if col == 'timestamp':
+                column[pos] = column[pos + RING_CAPACITY] = np.datetime64(metrics['timestamp'], 'ns')
+            else:
+                column[pos] = column[pos + RING_CAPACITY] = metrics[col]
+        # Publish only after every column holds the new sample
+        self._ring_count = ring_count + 1
+        self._ring_seq += 1
+    
+    def _ring_window(self, count: int) -> slice:
+        """Get the contiguous ring slice holding the most recent samples"""
+        ring_count = self._ring_count  # Read once so a concurrent write cannot skew the window
+        count = min(count, ring_count, RING_CAPACITY)
+        end = (ring_count - 1) % RING_CAPACITY + RING_CAPACITY + 1
+        return slice(end - count, end)
+    
+    def _ring_read(self, count: int, read):
+        """Apply read to the latest window, retrying until no write overlapped it"""
+        while True:
+            seq = self._ring_seq
+            if seq & 1:
+                time.sleep(0)  # Let the writer finish
+                continue
+            result = read(self._ring_window(count))
+            if self._ring_seq == seq:
+                return result
+    
+    def get_recent_as_arrays(self, count: int = 100, copy: bool = False) -> Dict[str, np.ndarray]:
+        """Get column views over the most recent samples, without copying or locking
         
-        self._save_metrics()
+        Views alias the live buffer. The next write lands just outside any window
+        shorter than RING_CAPACITY, so such views stay stable for at least one sample.
+        Pass copy=True for a consistent snapshot that long-running readers can keep.
+        """
+        if copy:
+            return self._ring_read(count, lambda window: {col: column[window].copy()
+                                                          for col, column in self._ring.items()})
+        window = self._ring_window(count)
+        return {col: column[window] for col, column in self._ring.items()}
+    
+    def get_recent_means(self, count: int = 10) -> Optional[np.ndarray]:
+        """Get the mean of each ring column over the most recent samples"""
+        def read(window):
+            if window.stop == window.start:
+                return None
+            return self._ring_block[:, window].mean(axis=1, dtype=np.float64)
+        return self._ring_read(count, read)
+    
+    def recompute_load_scores(self) -> np.ndarray:
+        """Recompute the ring's load_score column in bulk from its cpu, memory and response columns"""
+        ring = self._ring
+        with self._ring_lock:
+            self._ring_seq += 1
+            # Both mirrored halves are rewritten, so the latest window stays contiguous
+            scores = calculate_load_scores(ring['cpu_percent'], ring['memory_percent'], ring['response_time_ms'])
+            np.round(scores, 2, out=ring['load_score'])
+            self._ring_seq += 1
+        return self.get_recent_as_arrays(RING_CAPACITY)['load_score']
     
     def get_recent_metrics(self, count: int = 100) -> List[Dict]:
         """Get recent metrics"""
-        return self.metrics_history[-count:] if self.metrics_history else []
+        # list() copies the deque in one C call, so a concurrent append can't break the read
+        return [sample.to_dict() for sample in list(self.metrics_history)[-count:]] if self.metrics_history else []
     
     def get_metrics_summary(self) -> Dict:
         """Get summary statistics of recent metrics"""
-        if not self.metrics_history:
+        means = self.get_recent_means(50)
+        if means is None:
             return {}
         
-        recent = self.get_recent_metrics(50)
-        
+        # Columns are float32, so round away the single-precision noise
+        avg_cpu, avg_memory, avg_response_time, avg_load_score = np.round(means, 2).tolist()
         return {
-            'avg_cpu': sum(m['cpu_percent'] for m in recent) / len(recent),
-            'avg_memory': sum(m['memory_percent'] for m in recent) / len(recent),
-            'avg_response_time': sum(m['response_time_ms'] for m in recent) / len(recent),
-            'avg_load_score': sum(m['load_score'] for m in recent) / len(recent),
+            'avg_cpu': avg_cpu,
+            'avg_memory': avg_memory,
+            'avg_response_time': avg_response_time,
+            'avg_load_score': avg_load_score,
             'total_samples': len(self.metrics_history)
         }
     
+    def _get_static_info(self) -> Dict:
+        """Get host facts that do not change while the process runs"""
+        if self._static_info is None:
+            self._static_info = {
+                'system_info': {
+                    'platform': platform.platform(),
+                    'processor': platform.processor(),
+                    'architecture': platform.architecture()[0],
+                    'machine': platform.machine(),
+                    'node': platform.node(),
+                    'username': getpass.getuser(),
+                    'python_version': platform.python_version()
+                },
+                'boot_time': datetime.fromtimestamp(psutil.boot_time()).isoformat(),
+                'cpu_count': psutil.cpu_count(),
+                'memory_total_gb': round(psutil.virtual_memory().total / (1024**3), 2)
+            }
+        return self._static_info
+    
+    def _get_network_info(self) -> Dict:
+        """Get hostname and local IP, re-resolved at most every NETWORK_INFO_TTL seconds"""
+        cached = self._network_info
+        now = time.monotonic()
+        if cached is not None and now < cached[0]:
+            return cached[1]
+        
+        hostname = socket.gethostname()
+        info = {
+            'hostname': hostname,
+            'local_ip': socket.gethostbyname(hostname)
+        }
+        self._network_info = (now + NETWORK_INFO_TTL, info)
+        return info
+    
     def get_system_verification(self, current_metrics: Optional[Dict] = None) -> Dict:
         """Get system verification info to prove metrics are real - uses SAME data sources as dashboard"""
-        import platform
-        import socket
-        import getpass
+        static_info = self._get_static_info()
         
-        # Use provided metrics or collect new ones
+        # Use provided metrics or reuse/collect a fresh sample
         if current_metrics is None:
-            current_metrics = self.collect_metrics()
+            current_metrics = self.get_or_collect()
         
-        # Get system info
-        try:
-            if os.name == 'nt':  # Windows
-                disk_total, disk_used, disk_free = shutil.disk_usage('C:')
-            else:  # Unix/Linux
-                disk_total, disk_used, disk_free = shutil.disk_usage('/')
-        except Exception as e:
-            print(f"Disk usage error in verification: {e}")
-            disk_total = 0
-            disk_used = 0
-            disk_free = 0
-        
-        memory = psutil.virtual_memory()
-        
-        # Get network info with error handling
-        try:
-            network = psutil.net_io_counters()
-            network_sent = int(network.bytes_sent) if network else 0
-            network_recv = int(network.bytes_recv) if network else 0
-        except:
-            network_sent = 0
-            network_recv = 0
+        # Raw values come from the same sweep as the metrics when they were collected here
+        last = self._last
+        if last is not None and last[1] is current_metrics:
+            counters = last[2]
+        else:
+            counters = self._read_counters()
+        memory, disk, network_sent, network_recv = counters
+        disk_total, disk_used, disk_free = (disk.total, disk.used, disk.free) if disk else (0, 0, 0)
         
         verification = {
-            'system_info': {
-                'platform': platform.platform(),
-                'processor': platform.processor(),
-                'architecture': platform.architecture()[0],
-                'machine': platform.machine(),
-                'node': platform.node(),
-                'username': getpass.getuser(),
-                'python_version': platform.python_version()
-            },
-            'network_info': {
-                'hostname': socket.gethostname(),
-                'local_ip': socket.gethostbyname(socket.gethostname())
-            },
+            'system_info': dict(static_info['system_info']),
+            'network_info': dict(self._get_network_info()),
             'live_verification': {
                 'timestamp': current_metrics['timestamp'],
                 'process_count': len(psutil.pids()),
-                'boot_time': datetime.fromtimestamp(psutil.boot_time()).isoformat(),
-                'cpu_count': psutil.cpu_count(),
-                'memory_total_gb': round(memory.total / (1024**3), 2)
+                'boot_time': static_info['boot_time'],
+                'cpu_count': static_info['cpu_count'],
+                'memory_total_gb': static_info['memory_total_gb']
             },
             'current_dashboard_metrics': {
                 'cpu_percent': current_metrics['cpu_percent'],
@@ -198,7 +598,7 @@ class MetricsCollector:
                 'load_score': current_metrics['load_score']
             },
             'raw_system_data': {
-                'cpu_percent_raw': float(psutil.cpu_percent(interval=0.5)),
+                'cpu_percent_raw': current_metrics['cpu_percent'],
                 'memory_total_bytes': memory.total,
                 'memory_used_bytes': memory.used,
                 'memory_available_bytes': memory.available,
@@ -214,25 +614,28 @@ class MetricsCollector:
     
     def get_process_details(self, limit: int = 10) -> List[Dict]:
         """Get details of running processes to prove real system monitoring"""
-        processes = []
+        # Back-to-back verification probes within the same second share one scan
+        cache_key = (int(time.time()), limit)
+        cached = self._process_cache
+        if cached is not None and cached[0] == cache_key:
+            return list(cached[1])
         
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    proc_info = proc.info
-                    if proc_info['cpu_percent'] is not None:
-                        processes.append({
-                            'pid': proc_info['pid'],
-                            'name': proc_info['name'],
-                            'cpu_percent': round(proc_info['cpu_percent'], 2),
-                            'memory_percent': round(proc_info['memory_percent'], 2)
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # process_iter fills proc.info itself (None for denied fields), so one
+            # pass filters and a partial sort picks the top processes by CPU usage
+            infos = (proc.info for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']))
+            top_infos = heapq.nlargest(limit, (info for info in infos if info['cpu_percent'] is not None),
+                                       key=operator.itemgetter('cpu_percent'))
             
-            # Sort by CPU usage and return top processes
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-            return processes[:limit]
+            # Only the selected processes are formatted
+            top = [{
+                'pid': info['pid'],
+                'name': info['name'],
+                'cpu_percent': round(info['cpu_percent'], 2),
+                'memory_percent': round(info['memory_percent'] or 0.0, 2)
+            } for info in top_infos]
+            self._process_cache = (cache_key, top)
+            return list(top)
             
         except Exception as e:
             return [{'error': f'Failed to get process details: {str(e)}'}]
@@ -2,36 +2,78 @@ import time
 import json
 import os
 import psutil
+import orjson
 import shutil
-from typing import Dict, List
+import functools
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from metrics_collector import DISK_ROOT
+
+EXECUTION_HISTORY_SIZE = 500
+SCALING_EVENTS_SIZE = 50
+EVENTS_LOG_MAX_BYTES = 256 * 1024  # Compact the event log back to the retained events past this
+
+@functools.lru_cache(maxsize=1)
+def _system_specs() -> Tuple[int, float, float]:
+    """CPU cores, memory GB and storage GB of this machine, fixed for the process lifetime"""
+    # Get real system specifications
+    memory_gb = round(psutil.virtual_memory().total / (1024**3), 1)
+    cpu_cores = psutil.cpu_count()
+    
+    # Get disk space for system drive
+    try:
+        total, used, free = shutil.disk_usage(DISK_ROOT)
+        storage_gb = round(total / (1024**3), 1)
+    except Exception as e:
+        print(f"Disk usage error: {e}")
+        storage_gb = 500  # Reasonable fallback
+    
+    return cpu_cores, memory_gb, storage_gb
+
+def _read_tail_lines(path: str, count: int, block_size: int = 4096) -> List[bytes]:
+    """Last 'count' lines of a file, reading backwards in blocks so large logs stay cheap"""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b''
+        # One newline more than needed, so a partial first line is never returned
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return data.splitlines()[-count:]
 
 class ResourceManager:
     """Executes scaling decisions and manages resources"""
     
-    def __init__(self, state_file: str = "resource_state.json", metrics_collector=None):
+    def __init__(self, state_file: str = "resource_state.json", metrics_collector=None,
+                 simulate_time: bool = False, events_file: str = "scaling_events.ndjson"):
         self.state_file = state_file
+        self.events_file = events_file
         self.metrics_collector = metrics_collector
+        self.simulate_time = simulate_time  # Really sleep through provisioning steps (live demos)
+        self._virtual_time_elapsed = 0.0  # Simulated step time accounted instead of slept
         self.current_state = self._load_state()
-        self.execution_history = []
+        self.execution_history = deque(maxlen=EXECUTION_HISTORY_SIZE)
+        
+        # Scaling events go to an append-only log, so a decision writes one line, not the whole state
+        self._events_log = open(self.events_file, 'ab')
+        self._events_size = self._events_log.tell()
+        if self._events_size == 0 and self.current_state['scaling_events']:
+            # Events loaded from a state file that predates the log; carry them over before
+            # _save_state drops them from the state file
+            self._compact_events()
+        self._failed_count = 0  # Over the process lifetime, not just the retained history
+        
+        if metrics_collector is None:
+            # Prime the non-blocking CPU sample and the network baseline used by the psutil fallback
+            psutil.cpu_percent(interval=None)
+            self._prev_net = (psutil.net_io_counters(), time.monotonic())
         
     def _load_state(self) -> Dict:
         """Load current resource state"""
-        # Get real system specifications
-        memory_gb = round(psutil.virtual_memory().total / (1024**3), 1)
-        cpu_cores = psutil.cpu_count()
-        
-        # Get disk space for system drive
-        try:
-            if os.name == 'nt':  # Windows
-                total, used, free = shutil.disk_usage('C:')
-                storage_gb = round(total / (1024**3), 1)
-            else:  # Unix/Linux
-                total, used, free = shutil.disk_usage('/')
-                storage_gb = round(total / (1024**3), 1)
-        except Exception as e:
-            print(f"Disk usage error: {e}")
-            storage_gb = 500  # Reasonable fallback
+        cpu_cores, memory_gb, storage_gb = _system_specs()
         
         default_state = {
             'instances': 1,
@@ -50,34 +92,86 @@ class ResourceManager:
         
         if os.path.exists(self.state_file):
             try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
+                with open(self.state_file, 'rb') as f:
+                    state = orjson.loads(f.read())
                     default_state.update(state)
             except:
                 pass
         
+        # Bounded event log; the oldest events fall off as new ones arrive. Events that
+        # predate the log were saved in the state file and are used until it exists.
+        events = self._load_events()
+        if events is None:
+            events = default_state['scaling_events']
+        default_state['scaling_events'] = deque(events, maxlen=SCALING_EVENTS_SIZE)
         return default_state
     
+    def _load_events(self) -> Optional[List[Dict]]:
+        """Load the most recent scaling events from the log, or None if there is no log yet"""
+        if not os.path.exists(self.events_file):
+            return None
+        
+        events = []
+        try:
+            for line in _read_tail_lines(self.events_file, SCALING_EVENTS_SIZE):
+                try:
+                    events.append(orjson.loads(line))
+                except ValueError:
+                    continue  # Skip a torn or blank line
+        except OSError:
+            pass
+        return events
+    
     def _save_state(self):
-        """Save current state to file"""
+        """Save current state to file; scaling events live in their own log"""
         self.current_state['last_updated'] = datetime.now().isoformat()
-        with open(self.state_file, 'w') as f:
-            json.dump(self.current_state, f, indent=2)
+        header = {key: value for key, value in self.current_state.items() if key != 'scaling_events'}
+        data = orjson.dumps(header, option=orjson.OPT_SERIALIZE_NUMPY)
+        
+        # Write to a temp file and swap it in, so a crash mid-write never truncates the state
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.state_file)
+    
+    def _append_event(self, event: Dict):
+        """Append one scaling event to the log, compacting it once it grows too large"""
+        line = orjson.dumps(event, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+        self._events_log.write(line)
+        self._events_log.flush()
+        self._events_size += len(line)
+        if self._events_size > EVENTS_LOG_MAX_BYTES:
+            self._compact_events()
+    
+    def _compact_events(self):
+        """Rewrite the event log with only the events still held in memory"""
+        data = b"".join(orjson.dumps(event, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+                        for event in self.current_state['scaling_events'])
+        tmp_file = self.events_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        self._events_log.close()
+        os.replace(tmp_file, self.events_file)
+        self._events_log = open(self.events_file, 'ab')
+        self._events_size = len(data)
     
     def execute_scaling_decision(self, decision: Dict) -> Dict:
         """Execute a scaling decision and return execution result"""
-        timestamp = datetime.now().isoformat()
+        ts_ns = time.time_ns()
+        timestamp = datetime.fromtimestamp(ts_ns / 1e9).isoformat()
         
         # Simulate scaling execution time
         execution_time = self._simulate_scaling_time(decision['action'])
         
         execution_result = {
             'timestamp': timestamp,
+            'ts_ns': ts_ns,
             'decision_id': id(decision),
             'action': decision['action'],
             'status': 'started',
             'execution_time_seconds': execution_time,
-            'previous_state': dict(self.current_state),
+            # Only what a rollback needs; resources is replaced on scaling, never mutated in place
+            'previous_state': {key: self.current_state[key] for key in ('instances', 'resources', 'status')},
             'errors': [],
             'warnings': []
         }
@@ -99,6 +193,7 @@ class ResourceManager:
         except Exception as e:
             execution_result['status'] = 'failed'
             execution_result['errors'].append(str(e))
+            self._failed_count += 1
             print(f"Scaling execution failed: {e}")
         
         # Log execution
@@ -132,7 +227,7 @@ class ResourceManager:
             
             for step in steps:
                 print(f"  {instance_id}: {step}...")
-                time.sleep(0.2)  # Simulate time
+                self._simulate_step(0.2)
             
             provisioned_instances.append({
                 'id': instance_id,
@@ -173,7 +268,7 @@ class ResourceManager:
             
             for step in steps:
                 print(f"  {instance_id}: {step}...")
-                time.sleep(0.1)  # Simulate time
+                self._simulate_step(0.1)
             
             removed_instances.append({
                 'id': instance_id,
@@ -200,7 +295,7 @@ class ResourceManager:
         
         for check in checks:
             print(f"  {check}...")
-            time.sleep(0.1)
+            self._simulate_step(0.1)
         
         return {
             'instances_maintained': self.current_state['instances'],
@@ -218,6 +313,7 @@ class ResourceManager:
             # Add scaling event to history
             scaling_event = {
                 'timestamp': execution_result['timestamp'],
+                'ts_ns': execution_result['ts_ns'],
                 'action': decision['action'],
                 'instances_before': execution_result['previous_state']['instances'],
                 'instances_after': self.current_state['instances'],
@@ -226,10 +322,14 @@ class ResourceManager:
             }
             
             self.current_state['scaling_events'].append(scaling_event)
-            
-            # Keep only last 50 events
-            if len(self.current_state['scaling_events']) > 50:
-                self.current_state['scaling_events'] = self.current_state['scaling_events'][-50:]
+            self._append_event(scaling_event)
+    
+    def _simulate_step(self, seconds: float):
+        """Account for a simulated provisioning step, sleeping only when simulate_time is set"""
+        if self.simulate_time:
+            time.sleep(seconds)
+        else:
+            self._virtual_time_elapsed += seconds
     
     def _simulate_scaling_time(self, action: str) -> float:
         """Simulate realistic scaling times"""
@@ -242,14 +342,16 @@ class ResourceManager:
     
     def get_current_state(self) -> Dict:
         """Get current resource state with additional metrics"""
-        state = dict(self.current_state)
-        
-        # Add computed metrics
-        state['utilization'] = self._calculate_utilization()
-        state['cost_estimate'] = self._calculate_cost_estimate()
-        state['uptime'] = self._calculate_uptime()
-        
-        return state
+        # Add computed metrics, leaving the stored state untouched
+        return {
+            **self.current_state,
+            'scaling_events': list(self.current_state['scaling_events']),
+            'utilization': self._calculate_utilization(),
+            'cost_estimate': self._calculate_cost_estimate(),
+            'uptime': self._calculate_uptime(),
+            # Provisioning step time accounted rather than slept, when simulate_time is off
+            'simulated_time_seconds': round(self._virtual_time_elapsed, 2)
+        }
     
     def _calculate_utilization(self) -> Dict:
         """Calculate resource utilization based on real system metrics"""
@@ -261,17 +363,15 @@ class ResourceManager:
                 cpu_utilization = current_metrics['cpu_percent']
                 memory_utilization = current_metrics['memory_percent']
                 
-                # Get network utilization from recent metrics
-                recent_metrics = self.metrics_collector.get_recent_metrics(5)
-                if recent_metrics:
-                    # Calculate network utilization as percentage of recent activity
-                    network_bytes = [m['network_bytes_sent'] + m['network_bytes_recv'] for m in recent_metrics]
-                    if len(network_bytes) > 1:
-                        # Calculate rate of change as utilization indicator
-                        rate = (network_bytes[-1] - network_bytes[0]) / len(network_bytes)
-                        network_utilization = min(100, max(0, rate / 1024 / 1024))  # MB/s as percentage
-                    else:
-                        network_utilization = 10.0
+                # Get network utilization from the byte counters the collector already stores
+                recent = self.metrics_collector.get_recent_as_arrays(5)
+                ts_ns = recent['ts_ns']
+                if len(ts_ns) > 1 and ts_ns[-1] > ts_ns[0]:
+                    # Transfer rate between the oldest and newest of the recent samples
+                    delta_bytes = (int(recent['network_bytes_sent'][-1]) + int(recent['network_bytes_recv'][-1])
+                                   - int(recent['network_bytes_sent'][0]) - int(recent['network_bytes_recv'][0]))
+                    rate = delta_bytes / ((ts_ns[-1] - ts_ns[0]) / 1e9)
+                    network_utilization = min(100, max(0, rate / 1024 / 1024))  # MB/s as percentage
                 else:
                     network_utilization = 10.0
                 
@@ -280,30 +380,28 @@ class ResourceManager:
                 
             else:
                 # Fallback to direct psutil calls
-                cpu_utilization = psutil.cpu_percent(interval=1)
+                cpu_utilization = psutil.cpu_percent(interval=None)  # Since the previous call
                 memory_utilization = psutil.virtual_memory().percent
                 
                 # Get disk usage
                 try:
-                    if os.name == 'nt':  # Windows
-                        total, used, free = shutil.disk_usage('C:')
-                        disk_utilization = (used / total) * 100
-                    else:  # Unix/Linux
-                        total, used, free = shutil.disk_usage('/')
-                        disk_utilization = (used / total) * 100
+                    total, used, free = shutil.disk_usage(DISK_ROOT)
+                    disk_utilization = (used / total) * 100
                 except Exception as e:
                     print(f"Disk usage error: {e}")
                     disk_utilization = 50.0
                 
-                # Get network utilization
+                # Get network utilization as the transfer rate since the previous call
                 try:
-                    net_io = psutil.net_io_counters()
-                    if net_io:
-                        # Simple network activity indicator
-                        total_bytes = net_io.bytes_sent + net_io.bytes_recv
-                        network_utilization = min(50, (total_bytes / (1024**3)) * 10)  # Scale to percentage
+                    net_io, now = psutil.net_io_counters(), time.monotonic()
+                    prev_io, prev_time = self._prev_net
+                    if net_io and prev_io and now > prev_time:
+                        delta_bytes = (net_io.bytes_sent + net_io.bytes_recv) - (prev_io.bytes_sent + prev_io.bytes_recv)
+                        rate = delta_bytes / (now - prev_time)
+                        network_utilization = min(100, max(0, rate / 1024 / 1024))  # MB/s as percentage
                     else:
                         network_utilization = 5.0
+                    self._prev_net = (net_io, now)
                 except:
                     network_utilization = 5.0
             
@@ -342,7 +440,7 @@ class ResourceManager:
         """Calculate uptime statistics"""
         # Simplified uptime calculation
         total_events = len(self.current_state['scaling_events'])
-        failed_events = len([e for e in self.execution_history if e.get('status') == 'failed'])
+        failed_events = self._failed_count
         
         success_rate = 1.0 if total_events == 0 else (total_events - failed_events) / total_events
         
@@ -355,7 +453,8 @@ class ResourceManager:
     
     def get_scaling_history(self, limit: int = 20) -> List[Dict]:
         """Get recent scaling history"""
-        return self.current_state['scaling_events'][-limit:]
+        # list() copies the deque in one C call, so a concurrent append can't break the read
+        return list(self.current_state['scaling_events'])[-limit:]
     
     def rollback_last_scaling(self) -> Dict:
         """Rollback the last scaling operation"""
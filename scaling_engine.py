@@ -1,79 +1,334 @@
-from typing import Dict, List
+import numpy as np
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Dict, List, Sequence, Tuple, Union
 from datetime import datetime
+import copy
+import functools
+import itertools
 import json
+import logging
 import os
+import time
+from metrics_collector import isoformat_ns
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_DEFAULT_CONFIG = {
+    "min_instances": 1,
+    "max_instances": 10,
+    "scale_up_threshold": 70,
+    "scale_down_threshold": 30,
+    "scale_up_cooldown": 300,  # 5 minutes in seconds
+    "scale_down_cooldown": 600,  # 10 minutes in seconds
+    "confidence_threshold": 0.6,
+    "resource_limits": {
+        "cpu_cores": 16,
+        "memory_gb": 32,
+        "storage_gb": 500
+    }
+}
+
+# Config settings bound to attributes on every change, and the resource limits among them
+_BOUND_SETTINGS = ('min_instances', 'max_instances', 'scale_up_cooldown', 'scale_down_cooldown',
+                   'confidence_threshold')
+_BOUND_LIMITS = ('cpu_cores', 'memory_gb', 'storage_gb')
+
+# Merged config per absolute path as (mtime_ns, config), so engines built over an
+# unchanged file skip the read, parse and rewrite
+_CONFIG_CACHE: Dict[str, Tuple[int, Dict]] = {}
+
+# Load edges for judging a decision. bisect_left + bisect_right over them gives a
+# bucket per open interval and per edge: <30, 30, (30,50), 50, (50,70), 70, >70
+_EFFECTIVENESS_EDGES = (30, 50, 70)
+# Appropriateness of each action in each load bucket
+_EFFECTIVENESS = {
+    'scale_up': (0.3, 0.3, 0.3, 0.3, 0.7, 0.7, 0.9),    # Good above 70, reasonable above 50
+    'scale_down': (0.9, 0.7, 0.7, 0.3, 0.3, 0.3, 0.3),  # Good below 30, reasonable below 50
+    'maintain': (0.4, 0.8, 0.8, 0.8, 0.8, 0.8, 0.4)     # Good within 30-70
+}
+
+# Per-instance (cpu cores, memory GB, storage GB) at zero load, and the extra at full load
+_BASE_RESOURCES = (2, 4, 20)
+_LOAD_RESOURCES = (2, 4, 10)
+
+# How long a low-confidence or no-op maintain decision is reused for unchanged inputs
+_DECISION_REUSE_NS = 30 * 1_000_000_000
+
+# Decision log row; actions are stored as indexes into _ACTIONS
+DECISION_LOG_SIZE = 1024
+_ACTIONS = ('scale_up', 'scale_down', 'maintain')
+_ACTION_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+_DECISION_DTYPE = np.dtype([
+    ('ts_ns', 'i8'), ('action', 'u1'), ('confidence', 'f4'),
+    ('current_instances', 'i4'), ('recommended_instances', 'i4'),
+    ('predicted_load', 'f4'), ('max_predicted_load', 'f4'), ('hourly_cost_change', 'f4')
+])
+
+# Reason template for each final action
+_DECISION_REASONS = {
+    'scale_up': "Scaling up from {current} to {target} instances: {reason}",
+    'scale_down': "Scaling down from {current} to {target} instances: {reason}",
+    'maintain': "Maintaining {current} instances: {reason}"
+}
+
+# Simplified cost calculation (per instance per hour)
+_COST_PER_INSTANCE_HOUR = 0.10  # $0.10 per instance per hour
+
+_COST_IMPACT_KEYS = ('current_hourly_cost', 'target_hourly_cost', 'hourly_cost_change',
+                     'daily_cost_change', 'monthly_cost_change')
+
+@functools.lru_cache(maxsize=256)
+def _cost_impact(current_instances: int, target_instances: int) -> Tuple[float, float, float, float, float]:
+    """Cost figures for _COST_IMPACT_KEYS; instance counts are small, so every pair gets cached"""
+    current_cost = current_instances * _COST_PER_INSTANCE_HOUR
+    target_cost = target_instances * _COST_PER_INSTANCE_HOUR
+    cost_change = target_cost - current_cost
+    return (round(current_cost, 2), round(target_cost, 2), round(cost_change, 2),
+            round(cost_change * 24, 2), round(cost_change * 24 * 30, 2))
+
+def _mtime_ns(path: str):
+    """Modification time of path in nanoseconds, or None if it cannot be read"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _decide_kernel(action: str, current_instances: int, predicted_load: float,
+                   cpu_cap: float, memory_cap: float, storage_cap: float) -> Tuple:
+    """Target instances and their resources for one recommendation, in a single call
+    
+    Returns (target_instances, total cpu, total memory, total storage,
+    cpu per instance, memory per instance, storage per instance).
+    """
+    load_factor = predicted_load / 100
+    
+    # Simple scaling algorithm based on load
+    if action == 'scale_up':
+        # Scale up: add instances based on predicted load
+        target = current_instances + max(1, int(load_factor * 2))
+    elif action == 'scale_down':
+        # Scale down: remove instances if load is low
+        if predicted_load < 20:
+            target = max(1, current_instances - 2)
+        elif predicted_load < 40:
+            target = max(1, current_instances - 1)
+        else:
+            target = current_instances
+    else:
+        target = current_instances
+    
+    # Base resources per instance, adjusted based on load
+    cpu_base, memory_base, storage_base = _BASE_RESOURCES
+    cpu_extra, memory_extra, storage_extra = _LOAD_RESOURCES
+    cpu_per = cpu_base + load_factor * cpu_extra
+    memory_per = memory_base + load_factor * memory_extra
+    storage_per = storage_base + load_factor * storage_extra
+    
+    return (target, min(cpu_cap, target * cpu_per), min(memory_cap, target * memory_per),
+            min(storage_cap, target * storage_per), cpu_per, memory_per, storage_per)
+
+def _resources_dict(cpu: float, memory: float, storage: float,
+                    cpu_per: float, memory_per: float, storage_per: float) -> Dict:
+    """Resource allocation dict in the shape decisions carry"""
+    return {
+        'total_cpu_cores': cpu,
+        'total_memory_gb': memory,
+        'total_storage_gb': storage,
+        'cpu_per_instance': cpu_per,
+        'memory_per_instance': memory_per,
+        'storage_per_instance': storage_per
+    }
 
 class ScalingEngine:
     """Makes intelligent scaling decisions based on predictions and current state"""
     
+    # Fixed attribute layout; new attributes must be listed here
+    __slots__ = ('config_file', 'config', 'decision_history', 'version',
+                 '_last_scale_up_ns', '_last_scale_down_ns', '_cooldowns_seeded',
+                 '_last_key', '_last_key_ns', '_last_decision', '_decision_log', '_decision_log_head',
+                 '_min_instances', '_max_instances', '_scale_up_cooldown', '_scale_down_cooldown',
+                 '_confidence_threshold', '_cpu_cap', '_memory_cap', '_storage_cap', '_resource_caps')
+    
     def __init__(self, config_file: str = "scaling_config.json"):
         self.config_file = config_file
         self.config = self._load_config()
-        self.decision_history = []
+        try:
+            self._bind_config(self.config)
+        except ValueError as e:
+            logger.warning("Invalid scaling config in %s, using defaults: %s", self.config_file, e)
+            self.config = copy.deepcopy(_DEFAULT_CONFIG)
+            self._bind_config(self.config)
+        self.decision_history = deque(maxlen=1024)
+        # Ring of the last DECISION_LOG_SIZE decisions and the total ever logged
+        self._decision_log = np.zeros(DECISION_LOG_SIZE, dtype=_DECISION_DTYPE)
+        self._decision_log_head = 0
+        # Epoch ns of the newest scale-up and scale-down, so cooldowns are two comparisons
+        self._last_scale_up_ns = 0
+        self._last_scale_down_ns = 0
+        self._cooldowns_seeded = False
+        # Fingerprint, time and result of the last reusable maintain decision
+        self._last_key = None
+        self._last_key_ns = 0
+        self._last_decision = None
+        # Bumped on every decision or config change so clients can detect staleness
+        self.version = 0
         
     def _load_config(self) -> Dict:
         """Load scaling configuration"""
-        default_config = {
-            "min_instances": 1,
-            "max_instances": 10,
-            "scale_up_threshold": 70,
-            "scale_down_threshold": 30,
-            "scale_up_cooldown": 300,  # 5 minutes in seconds
-            "scale_down_cooldown": 600,  # 10 minutes in seconds
-            "confidence_threshold": 0.6,
-            "resource_limits": {
-                "cpu_cores": 16,
-                "memory_gb": 32,
-                "storage_gb": 500
-            }
-        }
-        
-        if os.path.exists(self.config_file):
+        default_config = copy.deepcopy(_DEFAULT_CONFIG)
+        
+        path = os.path.abspath(self.config_file)
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        mtime_ns = st.st_mtime_ns if st is not None else None
+        cached = _CONFIG_CACHE.get(path)
+        if mtime_ns is not None and cached is not None and cached[0] == mtime_ns:
+            return copy.deepcopy(cached[1])
+        
+        on_disk = None
+        if st is not None and st.st_size > 0:
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    # Merge with defaults
-                    default_config.update(config)
-            except:
-                pass
-        
-        # Save config for reference
-        with open(self.config_file, 'w') as f:
-            json.dump(default_config, f, indent=2)
-        
+                with open(path, 'rb') as f:
+                    on_disk = f.read()
+                loaded = json.loads(on_disk)
+                if not isinstance(loaded, dict):
+                    raise TypeError(f"expected a JSON object, got {type(loaded).__name__}")
+                if not isinstance(loaded.get('resource_limits', {}), dict):
+                    raise TypeError("resource_limits must be a JSON object")
+                # Merge with defaults
+                default_config.update(loaded)
+            except (OSError, ValueError, TypeError) as e:
+                # Keep the unreadable file for the user to fix rather than overwriting it
+                logger.warning("Could not load %s, using default scaling config: %s", path, e)
+                _CONFIG_CACHE[path] = (mtime_ns, copy.deepcopy(default_config))
+                return default_config
+        
+        # Save config for reference, unless the file already holds exactly this
+        data = json.dumps(default_config, indent=2).encode()
+        if data != on_disk:
+            with open(path, 'wb') as f:
+                f.write(data)
+            mtime_ns = _mtime_ns(path)
+        
+        _CONFIG_CACHE[path] = (mtime_ns, copy.deepcopy(default_config))
         return default_config
     
+    def _bind_config(self, config: Dict):
+        """Bind the config values read on every decision to attributes
+        
+        Raises ValueError, with nothing bound, if a setting is missing or not a number.
+        """
+        try:
+            limits = config['resource_limits']
+            values = [config[key] for key in _BOUND_SETTINGS] + [limits[key] for key in _BOUND_LIMITS]
+        except KeyError as e:
+            raise ValueError(f"missing config setting {e}") from e
+        except TypeError as e:
+            raise ValueError("resource_limits must be an object") from e
+        if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            raise ValueError("config settings must be numbers")
+        
+        (self._min_instances, self._max_instances, self._scale_up_cooldown, self._scale_down_cooldown,
+         self._confidence_threshold, self._cpu_cap, self._memory_cap, self._storage_cap) = values
+        self._resource_caps = np.array([self._cpu_cap, self._memory_cap, self._storage_cap], dtype=np.float64)
+    
+    def update_config(self, new_config: Dict) -> Dict:
+        """Apply configuration overrides, merging nested sections such as resource_limits
+        
+        Raises ValueError, leaving the engine unchanged, if the merged config is invalid.
+        """
+        config = copy.deepcopy(self.config)
+        for key, value in new_config.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+        
+        self._bind_config(config)
+        self.config = config
+        self._last_key = None
+        self.version += 1
+        return self.config
+    
     def make_scaling_decision(self, 
                             current_state: Dict, 
                             recommendation: Dict, 
-                            recent_decisions: List[Dict] = None) -> Dict:
+                            recent_decisions: Sequence[Dict] = None) -> Dict:
         """Make final scaling decision considering all factors"""
         
-        timestamp = datetime.now().isoformat()
+        # Epoch nanoseconds for cooldown arithmetic, plus the matching local ISO string
+        ts_ns = time.time_ns()
+        timestamp = isoformat_ns(ts_ns)
+        self.version += 1
+        
+        # Inputs that settle the outcome, exact: confidence and loads are compared against
+        # thresholds, so any rounding could map both sides of one to the same key
+        key = (recommendation['confidence'], current_state.get('load_score'),
+               current_state.get('current_instances', 1), recommendation.get('max_predicted_load'),
+               recommendation['action'], recommendation.get('reason'))
+        elapsed_ns = ts_ns - self._last_key_ns
+        if key == self._last_key and elapsed_ns < _DECISION_REUSE_NS:
+            decision = dict(self._last_decision, timestamp=timestamp, ts_ns=ts_ns)
+        else:
+            decision = self._decide(current_state, recommendation, recent_decisions, timestamp, ts_ns)
+            # Only maintain is safe to repeat; a repeated scale action would skip its cooldown, and a
+            # cooldown maintain would outlive a cooldown shorter than the reuse window
+            if decision['action'] == 'maintain' and 'cooldown_remaining' not in decision:
+                self._last_key, self._last_key_ns, self._last_decision = key, ts_ns, decision
+            else:
+                self._last_key = None
+        
+        # Log a fixed-size row in place; dicts are only rebuilt on export
+        cost_impact = decision.get('cost_impact')
+        self._decision_log[self._decision_log_head % DECISION_LOG_SIZE] = (
+            ts_ns, _ACTION_CODES[decision['action']], decision['confidence'],
+            current_state.get('current_instances', 1), decision['recommended_instances'],
+            recommendation.get('predicted_load', 0), recommendation.get('max_predicted_load', 0),
+            cost_impact['hourly_cost_change'] if cost_impact else 0.0)
+        self._decision_log_head += 1
+        return decision
+    
+    def get_decision_log(self, count: int = None, as_dicts: bool = False) -> Union[np.ndarray, List[Dict]]:
+        """Last count logged decisions (all retained by default), oldest first
+        
+        Returns a copy of the structured rows, or plain dicts with as_dicts=True.
+        """
+        head = self._decision_log_head
+        n = min(head, DECISION_LOG_SIZE) if count is None else max(0, min(count, head, DECISION_LOG_SIZE))
+        rows = self._decision_log[np.arange(head - n, head) % DECISION_LOG_SIZE]
+        if not as_dicts:
+            return rows
+        return [{
+            'timestamp': isoformat_ns(int(row['ts_ns'])),
+            'ts_ns': int(row['ts_ns']),
+            'action': _ACTIONS[row['action']],
+            'confidence': float(row['confidence']),
+            'current_instances': int(row['current_instances']),
+            'recommended_instances': int(row['recommended_instances']),
+            'predicted_load': float(row['predicted_load']),
+            'max_predicted_load': float(row['max_predicted_load']),
+            'hourly_cost_change': float(row['hourly_cost_change'])
+        } for row in rows]
+    
+    def _decide(self, current_state: Dict, recommendation: Dict,
+                recent_decisions: Sequence[Dict], timestamp: str, ts_ns: int) -> Dict:
+        """Run the full decision pipeline for one tick"""
+        # Check confidence threshold first; it is a single comparison
+        if recommendation['confidence'] < self._confidence_threshold:
+            return self._maintain_response(current_state, timestamp, ts_ns,
+                                           f"Low confidence: {recommendation['confidence']:.2f}",
+                                           recommendation['confidence'])
         
         # Check cooldown periods
-        cooldown_check = self._check_cooldown(recent_decisions or [])
+        cooldown_check = self._check_cooldown(recent_decisions, ts_ns)
         if not cooldown_check['allowed']:
-            return {
-                'timestamp': timestamp,
-                'action': 'maintain',
-                'reason': f"Cooldown active: {cooldown_check['reason']}",
-                'confidence': 1.0,
-                'recommended_instances': current_state.get('current_instances', 1),
-                'recommended_resources': current_state.get('current_resources', {}),
-                'cooldown_remaining': cooldown_check.get('remaining_time', 0)
-            }
-        
-        # Check confidence threshold
-        if recommendation['confidence'] < self.config['confidence_threshold']:
-            return {
-                'timestamp': timestamp,
-                'action': 'maintain',
-                'reason': f"Low confidence: {recommendation['confidence']:.2f}",
-                'confidence': recommendation['confidence'],
-                'recommended_instances': current_state.get('current_instances', 1),
-                'recommended_resources': current_state.get('current_resources', {})
-            }
+            return self._maintain_response(current_state, timestamp, ts_ns,
+                                           f"Cooldown active: {cooldown_check['reason']}", 1.0,
+                                           {'cooldown_remaining': cooldown_check.get('remaining_time', 0)})
         
         # Calculate target instances and resources
         target_instances, target_resources = self._calculate_target_resources(
@@ -81,24 +336,26 @@ class ScalingEngine:
         )
         
         # Validate against limits
-        target_instances = max(self.config['min_instances'], 
-                             min(self.config['max_instances'], target_instances))
+        target_instances = max(self._min_instances, min(self._max_instances, target_instances))
         
         # Determine final action
         current_instances = current_state.get('current_instances', 1)
         
         if target_instances > current_instances:
             action = 'scale_up'
+            self._last_scale_up_ns = ts_ns
         elif target_instances < current_instances:
             action = 'scale_down'
+            self._last_scale_down_ns = ts_ns
         else:
             action = 'maintain'
         
         # Create decision
         decision = {
             'timestamp': timestamp,
+            'ts_ns': ts_ns,
             'action': action,
-            'reason': self._generate_decision_reason(recommendation, target_instances, current_instances),
+            'reason': self._generate_decision_reason(recommendation, target_instances, current_instances, action),
             'confidence': recommendation['confidence'],
             'current_instances': current_instances,
             'recommended_instances': target_instances,
@@ -111,162 +368,161 @@ class ScalingEngine:
         
         return decision
     
-    def _check_cooldown(self, recent_decisions: List[Dict]) -> Dict:
-        """Check if scaling action is allowed based on cooldown periods"""
-        if not recent_decisions:
-            return {'allowed': True}
-        
-        current_time = datetime.now()
-        
-        for decision in reversed(recent_decisions[-10:]):  # Check last 10 decisions
-            decision_time = datetime.fromisoformat(decision['timestamp'])
-            time_diff = (current_time - decision_time).total_seconds()
-            
-            if decision['action'] == 'scale_up':
-                if time_diff < self.config['scale_up_cooldown']:
-                    remaining = self.config['scale_up_cooldown'] - time_diff
-                    return {
-                        'allowed': False,
-                        'reason': f"Scale-up cooldown active",
-                        'remaining_time': remaining
-                    }
-            
-            elif decision['action'] == 'scale_down':
-                if time_diff < self.config['scale_down_cooldown']:
-                    remaining = self.config['scale_down_cooldown'] - time_diff
-                    return {
-                        'allowed': False,
-                        'reason': f"Scale-down cooldown active",
-                        'remaining_time': remaining
-                    }
+    def make_scaling_decisions_batch(self,
+                                     current_instances: np.ndarray,
+                                     load_scores: np.ndarray,
+                                     confidences: np.ndarray,
+                                     max_predicted_loads: np.ndarray,
+                                     actions: np.ndarray) -> Dict[str, np.ndarray]:
+        """Decide N independent ticks at once, for backtesting a policy over recorded traces
+        
+        Each tick is decided as make_scaling_decision would, except that cooldowns are not
+        applied since they depend on the decisions taken before. NaN max predicted loads fall
+        back to the load score. Resources are only meaningful for confident ticks.
+        Returns column arrays of length N.
+        """
+        current = np.asarray(current_instances, dtype=np.int64)
+        loads = np.asarray(max_predicted_loads, dtype=np.float64)
+        loads = np.where(np.isnan(loads), np.asarray(load_scores, dtype=np.float64), loads)
+        actions = np.asarray(actions)
+        confident = np.asarray(confidences, dtype=np.float64) >= self._confidence_threshold
+        
+        scale_up = actions == 'scale_up'
+        scale_down = actions == 'scale_down'
+        target = np.where(scale_up, current + np.maximum(1, (loads / 100 * 2).astype(np.int64)),
+                 np.where(scale_down & (loads < 20), np.maximum(1, current - 2),
+                 np.where(scale_down & (loads < 40), np.maximum(1, current - 1), current)))
+        # Sized before the limits are applied, as the per-tick path does
+        resources = self._calculate_resource_allocation_batch(target, loads)
+        # Low-confidence ticks keep their instances, unclamped
+        target = np.where(confident, np.clip(target, self._min_instances, self._max_instances), current)
+        
+        return {
+            'action': np.where(target > current, 'scale_up', np.where(target < current, 'scale_down', 'maintain')),
+            'recommended_instances': target,
+            'total_cpu_cores': resources[:, 0],
+            'total_memory_gb': resources[:, 1],
+            'total_storage_gb': resources[:, 2],
+            'hourly_cost_change': np.round(target * _COST_PER_INSTANCE_HOUR - current * _COST_PER_INSTANCE_HOUR, 2)
+        }
+    
+    def _maintain_response(self, current_state: Dict, timestamp: str, ts_ns: int,
+                           reason: str, confidence: float, extra: Dict = None) -> Dict:
+        """Decision that keeps the current instances and resources"""
+        decision = {
+            'timestamp': timestamp,
+            'ts_ns': ts_ns,
+            'action': 'maintain',
+            'reason': reason,
+            'confidence': confidence,
+            'recommended_instances': current_state.get('current_instances', 1),
+            'recommended_resources': current_state.get('current_resources', {})
+        }
+        if extra:
+            decision.update(extra)
+        return decision
+    
+    def _check_cooldown(self, recent_decisions: Sequence[Dict] = None, now_ns: int = None) -> Dict:
+        """Check if scaling action is allowed based on cooldown periods
+        
+        recent_decisions only seeds the last scale-up and scale-down times on first use,
+        e.g. from history persisted before a restart; after that the engine tracks them itself.
+        """
+        if not self._cooldowns_seeded and recent_decisions:
+            self._seed_cooldowns(recent_decisions)
+        
+        if now_ns is None:
+            now_ns = time.time_ns()
+        
+        time_diff = (now_ns - self._last_scale_up_ns) / 1e9
+        if time_diff < self._scale_up_cooldown:
+            return {
+                'allowed': False,
+                'reason': f"Scale-up cooldown active",
+                'remaining_time': self._scale_up_cooldown - time_diff
+            }
+        
+        time_diff = (now_ns - self._last_scale_down_ns) / 1e9
+        if time_diff < self._scale_down_cooldown:
+            return {
+                'allowed': False,
+                'reason': f"Scale-down cooldown active",
+                'remaining_time': self._scale_down_cooldown - time_diff
+            }
         
         return {'allowed': True}
     
+    def _seed_cooldowns(self, recent_decisions: Sequence[Dict]):
+        """Take the newest scale-up and scale-down times from the last 10 recorded decisions"""
+        # Newest first; works on lists and deques without slicing
+        for decision in itertools.islice(reversed(recent_decisions), 10):
+            action = decision['action']
+            if action not in ('scale_up', 'scale_down'):
+                continue
+            ts_ns = decision.get('ts_ns')
+            if ts_ns is None:  # Recorded before decisions carried ts_ns
+                ts_ns = int(datetime.fromisoformat(decision['timestamp']).timestamp() * 1e9)
+            if action == 'scale_up':
+                self._last_scale_up_ns = max(self._last_scale_up_ns, ts_ns)
+            else:
+                self._last_scale_down_ns = max(self._last_scale_down_ns, ts_ns)
+        self._cooldowns_seeded = True
+    
     def _calculate_target_resources(self, current_state: Dict, recommendation: Dict) -> tuple:
         """Calculate target instances and resource allocation"""
-        current_instances = current_state.get('current_instances', 1)
         current_load = current_state.get('load_score', 50)
-        predicted_load = recommendation.get('max_predicted_load', current_load)
-        
-        # Simple scaling algorithm based on load
-        if recommendation['action'] == 'scale_up':
-            # Scale up: add instances based on predicted load
-            load_factor = predicted_load / 100
-            additional_instances = max(1, int(load_factor * 2))
-            target_instances = current_instances + additional_instances
-            
-        elif recommendation['action'] == 'scale_down':
-            # Scale down: remove instances if load is low
-            if predicted_load < 20:
-                target_instances = max(1, current_instances - 2)
-            elif predicted_load < 40:
-                target_instances = max(1, current_instances - 1)
-            else:
-                target_instances = current_instances
-        else:
-            target_instances = current_instances
-        
-        # Calculate resource allocation per instance
-        target_resources = self._calculate_resource_allocation(target_instances, predicted_load)
-        
-        return target_instances, target_resources
+        target_instances, cpu, memory, storage, cpu_per, memory_per, storage_per = _decide_kernel(
+            recommendation['action'], current_state.get('current_instances', 1),
+            recommendation.get('max_predicted_load', current_load),
+            self._cpu_cap, self._memory_cap, self._storage_cap)
+        return target_instances, _resources_dict(cpu, memory, storage, cpu_per, memory_per, storage_per)
     
     def _calculate_resource_allocation(self, instances: int, predicted_load: float) -> Dict:
         """Calculate optimal resource allocation"""
-        load_factor = predicted_load / 100
-        
-        # Base resources per instance
-        base_cpu = 2
-        base_memory = 4
-        base_storage = 20
-        
-        # Adjust based on load
-        cpu_per_instance = base_cpu + (load_factor * 2)
-        memory_per_instance = base_memory + (load_factor * 4)
-        storage_per_instance = base_storage + (load_factor * 10)
-        
-        total_resources = {
-            'total_cpu_cores': min(self.config['resource_limits']['cpu_cores'], 
-                                 instances * cpu_per_instance),
-            'total_memory_gb': min(self.config['resource_limits']['memory_gb'], 
-                                 instances * memory_per_instance),
-            'total_storage_gb': min(self.config['resource_limits']['storage_gb'], 
-                                  instances * storage_per_instance),
-            'cpu_per_instance': cpu_per_instance,
-            'memory_per_instance': memory_per_instance,
-            'storage_per_instance': storage_per_instance
-        }
-        
-        return total_resources
+        # 'maintain' keeps the instance count, leaving only the allocation math
+        return _resources_dict(*_decide_kernel('maintain', instances, predicted_load,
+                                               self._cpu_cap, self._memory_cap, self._storage_cap)[1:])
     
-    def _generate_decision_reason(self, recommendation: Dict, target: int, current: int) -> str:
-        """Generate human-readable reason for scaling decision"""
-        base_reason = recommendation['reason']
-        
-        if target > current:
-            return f"Scaling up from {current} to {target} instances: {base_reason}"
-        elif target < current:
-            return f"Scaling down from {current} to {target} instances: {base_reason}"
-        else:
-            return f"Maintaining {current} instances: {base_reason}"
+    def _calculate_resource_allocation_batch(self, instances: np.ndarray, predicted_loads: np.ndarray) -> np.ndarray:
+        """Total (cpu cores, memory GB, storage GB) for N candidate (instances, predicted load) pairs, as an (N, 3) array"""
+        load_factors = np.asarray(predicted_loads, dtype=np.float64)[:, None] / 100
+        per_instance = np.asarray(_BASE_RESOURCES, dtype=np.float64) + load_factors * np.asarray(_LOAD_RESOURCES, dtype=np.float64)
+        return np.minimum(self._resource_caps, np.asarray(instances, dtype=np.float64)[:, None] * per_instance)
+    
+    def _generate_decision_reason(self, recommendation: Dict, target: int, current: int, action: str) -> str:
+        """Generate human-readable reason for scaling decision, given the action already chosen"""
+        return _DECISION_REASONS[action].format(current=current, target=target, reason=recommendation['reason'])
     
     def _estimate_cost_impact(self, current_instances: int, target_instances: int) -> Dict:
         """Estimate cost impact of scaling decision"""
-        # Simplified cost calculation (per instance per hour)
-        cost_per_instance_hour = 0.10  # $0.10 per instance per hour
-        
-        current_cost = current_instances * cost_per_instance_hour
-        target_cost = target_instances * cost_per_instance_hour
-        cost_change = target_cost - current_cost
-        
-        return {
-            'current_hourly_cost': round(current_cost, 2),
-            'target_hourly_cost': round(target_cost, 2),
-            'hourly_cost_change': round(cost_change, 2),
-            'daily_cost_change': round(cost_change * 24, 2),
-            'monthly_cost_change': round(cost_change * 24 * 30, 2)
-        }
+        # Fresh dict per call so callers can't mutate the cached figures
+        return dict(zip(_COST_IMPACT_KEYS, _cost_impact(current_instances, target_instances)))
     
     def evaluate_scaling_effectiveness(self, 
                                      decision: Dict, 
-                                     actual_metrics: List[Dict]) -> Dict:
-        """Evaluate how effective a previous scaling decision was"""
-        if not actual_metrics:
+                                     actual_metrics: Union[List[Dict], Dict[str, np.ndarray]]) -> Dict:
+        """Evaluate how effective a previous scaling decision was
+        
+        actual_metrics is a list of sample dicts or a mapping of column arrays.
+        """
+        if isinstance(actual_metrics, dict):
+            actual_loads = np.asarray(actual_metrics['load_score'], dtype=np.float64)
+        else:
+            actual_loads = np.fromiter((m['load_score'] for m in actual_metrics),
+                                       dtype=np.float64, count=len(actual_metrics))
+        if len(actual_loads) == 0:
             return {'effectiveness': 'unknown', 'score': 0.5}
         
         predicted_load = decision.get('predicted_load', 50)
-        actual_loads = [m['load_score'] for m in actual_metrics]
-        avg_actual_load = sum(actual_loads) / len(actual_loads)
+        avg_actual_load = float(actual_loads.mean())
         
         # Calculate prediction accuracy
         prediction_error = abs(predicted_load - avg_actual_load)
         accuracy_score = max(0, 1 - (prediction_error / 100))
         
-        # Evaluate if scaling was appropriate
-        action = decision['action']
-        effectiveness_score = 0.5
-        
-        if action == 'scale_up':
-            if avg_actual_load > 70:
-                effectiveness_score = 0.9  # Good decision
-            elif avg_actual_load > 50:
-                effectiveness_score = 0.7  # Reasonable decision
-            else:
-                effectiveness_score = 0.3  # May have been premature
-        
-        elif action == 'scale_down':
-            if avg_actual_load < 30:
-                effectiveness_score = 0.9  # Good decision
-            elif avg_actual_load < 50:
-                effectiveness_score = 0.7  # Reasonable decision
-            else:
-                effectiveness_score = 0.3  # May have been too aggressive
-        
-        else:  # maintain
-            if 30 <= avg_actual_load <= 70:
-                effectiveness_score = 0.8  # Good decision to maintain
-            else:
-                effectiveness_score = 0.4  # Maybe should have acted
+        # Evaluate if scaling was appropriate; anything other than a scale action counts as maintain
+        bucket = bisect_left(_EFFECTIVENESS_EDGES, avg_actual_load) + bisect_right(_EFFECTIVENESS_EDGES, avg_actual_load)
+        effectiveness_score = _EFFECTIVENESS.get(decision['action'], _EFFECTIVENESS['maintain'])[bucket]
         
         overall_score = (accuracy_score + effectiveness_score) / 2
         
@@ -279,6 +535,9 @@ class ScalingEngine:
             'decision_appropriateness': round(effectiveness_score, 2),
             'predicted_load': predicted_load,
             'actual_avg_load': round(avg_actual_load, 2),
+            # Peak and trough tell a spiky window apart from a steady one with the same average
+            'peak_load': round(float(actual_loads.max()), 2),
+            'min_load': round(float(actual_loads.min()), 2),
             'prediction_error': round(prediction_error, 2)
         }
 
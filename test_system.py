@@ -7,14 +7,15 @@ This script validates all components work correctly
 import sys
 import time
 import json
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
 
 def test_metrics_collector():
     """Test the metrics collector"""
     print("🧪 Testing Metrics Collector...")
     
     try:
-        from metrics_collector import MetricsCollector
+        from metrics_collector import MetricsCollector, calculate_load_scores
         
         collector = MetricsCollector()
         
@@ -30,6 +31,17 @@ def test_metrics_collector():
         recent = collector.get_recent_metrics(1)
         assert len(recent) == 1
         
+        # Test ring buffer means
+        means = collector.get_recent_means(1)
+        assert means is not None
+        assert abs(means[3] - metrics['load_score']) < 0.01
+        columns = collector.get_recent_as_arrays(1)
+        assert len(columns['load_score']) == 1
+        
+        # Test batched load scores against the stored per-sample score
+        scores = calculate_load_scores(columns['cpu_percent'], columns['memory_percent'], columns['response_time_ms'])
+        assert abs(scores[0] - metrics['load_score']) < 0.01
+        
         print("✅ Metrics Collector: PASSED")
         return True
         
@@ -43,20 +55,26 @@ def test_predictor():
     
     try:
         from predictor import DemandPredictor
-        from metrics_collector import MetricsCollector
         
         predictor = DemandPredictor()
-        collector = MetricsCollector()
         
-        # Generate some test data
-        test_metrics = []
-        for i in range(15):
-            metrics = collector.collect_metrics()
-            test_metrics.append(metrics)
-            time.sleep(0.1)
+        # Generate deterministic test data in the collector's sample schema
+        rng = np.random.default_rng(0)
+        start = datetime.now()
+        cpu = rng.uniform(20, 80, 15)
+        memory = rng.uniform(30, 70, 15)
+        load = rng.uniform(20, 90, 15)
+        test_metrics = [{
+            'timestamp': (start + timedelta(minutes=i)).isoformat(),
+            'cpu_percent': float(cpu[i]),
+            'memory_percent': float(memory[i]),
+            'response_time_ms': 50 + float(cpu[i]) * 2,
+            'load_score': float(load[i])
+        } for i in range(15)]
         
         # Test model training
         success = predictor.train_model(test_metrics)
+        assert success
         
         if success:
             # Test predictions
@@ -111,6 +129,20 @@ def test_scaling_engine():
         assert 'action' in decision
         assert 'confidence' in decision
         assert 'recommended_instances' in decision
+        assert engine.get_decision_log(1, as_dicts=True)[0]['recommended_instances'] == decision['recommended_instances']
+        
+        # Test the batch path agrees with the per-tick decision
+        batch = ScalingEngine().make_scaling_decisions_batch(
+            np.array([2]), np.array([75.0]), np.array([0.8]), np.array([np.nan]), np.array(['scale_up']))
+        assert batch['recommended_instances'][0] == decision['recommended_instances']
+        assert batch['action'][0] == decision['action']
+        
+        # Test a memoized low-confidence maintain doesn't hold back a confident scale-up
+        memo_engine = ScalingEngine()
+        low = memo_engine.make_scaling_decision(current_state, dict(recommendation, confidence=0.56))
+        assert low['action'] == 'maintain'
+        high = memo_engine.make_scaling_decision(current_state, dict(recommendation, confidence=0.64))
+        assert high['action'] == 'scale_up'
         
         print("✅ Scaling Engine: PASSED")
         return True
@@ -202,14 +234,13 @@ def run_performance_test():
         
         collector = MetricsCollector()
         
-        # Test metrics collection speed
-        start_time = time.time()
-        for i in range(10):
-            metrics = collector.collect_metrics()
-            collector.store_metrics(metrics)
+        # Test metrics collection speed, storing the samples as one batch
+        start_ns = time.perf_counter_ns()
+        batch = [collector.collect_metrics() for _ in range(10)]
+        collector.store_metrics_batch(batch)
         
-        end_time = time.time()
-        avg_time = (end_time - start_time) / 10
+        avg_time = (time.perf_counter_ns() - start_ns) / 1e9 / 10
+        assert collector.get_recent_metrics(1)[0]['timestamp'] == batch[-1]['timestamp']
         
         print(f"   Average metrics collection time: {avg_time:.3f}s")
         